@@ -1,2 +1,37 @@
 """SAPient MCP — Intelligent SAP GUI automation for AI agents."""
+from __future__ import annotations
+
+import importlib
+import os
+
 __version__ = "1.0.0"
+
+# Public names resolved on first access (PEP 562) so that importing the
+# package — e.g. for `python -m sapient_mcp --help` — does not pull in
+# mcp, pydantic or RoboSAPiens.
+_LAZY_ATTRS: dict[str, str] = {
+    "build_server": ".server",
+    "SAPSessionManager": ".session",
+    "load_config": ".config",
+}
+
+__all__ = ["__version__", "build_server", "SAPSessionManager", "load_config"]
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *_LAZY_ATTRS})
+
+
+# CI / packaging checks: resolve everything up-front to surface import errors.
+if os.environ.get("SAPIENT_EAGER_IMPORT") == "1":
+    for _name in _LAZY_ATTRS:
+        __getattr__(_name)
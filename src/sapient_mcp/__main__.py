@@ -19,35 +19,96 @@ Usage examples:
 """
 from __future__ import annotations
 
-import argparse
-import logging
+import os
 import sys
-from pathlib import Path
 
+# typing.TYPE_CHECKING without importing typing on the --help/--version path
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import argparse
+    import logging
+    import logging.handlers
 
-def _setup_logging(log_file: Path) -> None:
+# Background listener that owns the real log handlers (see _setup_logging).
+_log_listener: logging.handlers.QueueListener | None = None
+
+
+def _setup_logging(log_file: str | os.PathLike, *, stderr: bool = False) -> None:
     """
     In stdio mode ALL stdout/stderr must be clean JSON-RPC.
     Therefore logs go to a file only.
     In SSE mode logs can also go to stderr — we handle both.
+
+    SAPIENT_LOG_LEVEL (default INFO) sets the root level.
+    The root logger only gets a QueueHandler; a QueueListener thread performs
+    the actual file/stderr writes so tool calls never block on log I/O.
     """
-    log_file.parent.mkdir(parents=True, exist_ok=True)
-    handlers: list[logging.Handler] = [
-        logging.FileHandler(log_file, encoding="utf-8"),
-    ]
+    import atexit  # noqa: PLC0415
+    import logging  # noqa: PLC0415
+    import logging.handlers  # noqa: PLC0415
+    import queue  # noqa: PLC0415
+
+    from .log_handlers import BufferedFileHandler  # noqa: PLC0415
+
+    global _log_listener
+
+    level = logging.getLevelName(os.environ.get("SAPIENT_LOG_LEVEL", "INFO").upper())
+    if not isinstance(level, int):
+        level = logging.INFO
+
+    log_file = os.fspath(log_file)
+    parent = os.path.dirname(log_file)
+    if parent and not os.path.isdir(parent):
+        os.makedirs(parent, exist_ok=True)
+    if level >= logging.WARNING:
+        # Only warnings/errors will be written — skip timestamp formatting
+        fmt = logging.Formatter("%(message)s")
+    else:
+        fmt = logging.Formatter(
+            "%(asctime)s  %(levelname)-8s  %(name)s  %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S",
+        )
+    handlers: list[logging.Handler] = [BufferedFileHandler(log_file, encoding="utf-8")]
     # Only add stderr handler in non-stdio (HTTP/SSE) mode
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s  %(levelname)-8s  %(name)s  %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-        handlers=handlers,
-        force=True,
-    )
+    if stderr:
+        handlers.append(logging.StreamHandler(sys.stderr))
+    for handler in handlers:
+        handler.setFormatter(fmt)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    # Records are fully formatted by the listener's handlers, not here
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    logging.basicConfig(level=level, handlers=[queue_handler], force=True)
+
+    _log_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+
+def _quiet_noisy_loggers() -> None:
+    """
+    Cap third-party loggers at WARNING — only for libraries actually imported,
+    so unused ones don't get logger objects materialised. Call once the
+    server's dependencies are loaded (i.e. after build_server()).
+    """
+    import logging  # noqa: PLC0415
+
+    level = max(logging.getLogger().level, logging.WARNING)
     for noisy in ("asyncio", "mcp", "httpx", "urllib3"):
-        logging.getLogger(noisy).setLevel(logging.WARNING)
+        if noisy in sys.modules:
+            logging.getLogger(noisy).setLevel(level)
+
+
+# Value-carrying flags; each CLI attribute is also the config key. Values are
+# passed through raw, so e.g. --caps is parsed by the same validator
+# (RoboSAPiensMCPConfig.parse_caps) as env vars and config files.
+_OVERRIDE_FLAGS = ("port", "host", "caps", "saplogon_path", "sap_server", "output_dir")
 
 
 def _build_arg_parser() -> argparse.ArgumentParser:
+    import argparse  # noqa: PLC0415
+
     p = argparse.ArgumentParser(
         prog="sapient-mcp",
         description="SAPient MCP Server — Intelligent SAP GUI automation for AI agents",
@@ -69,62 +130,109 @@ def _build_arg_parser() -> argparse.ArgumentParser:
     return p
 
 
+class CliArgs:
+    """
+    Parsed CLI flags. Used as the argparse namespace (and, unparsed, as the
+    defaults for a bare launch) so every `args.x` is a slot read.
+    """
+    __slots__ = (
+        "config",
+        "port",
+        "host",
+        "caps",
+        "saplogon_path",
+        "sap_server",
+        "output_dir",
+        "no_screenshot_on_error",
+    )
+
+    def __init__(self) -> None:
+        self.config: str | None = None
+        self.port: int | None = None
+        self.host: str | None = None
+        self.caps: str | None = None
+        self.saplogon_path: str | None = None
+        self.sap_server: str | None = None
+        self.output_dir: str | None = None
+        self.no_screenshot_on_error: bool = False
+
+
+def _run_import_profile(target: str) -> int:
+    """
+    Re-run the server in a child interpreter with `-X importtime` and
+    `-X faulthandler`, sending the child's stderr to `target`
+    (startup_profile.log when SAPIENT_IMPORT_PROFILE=1). stdin/stdout are
+    inherited, so stdio mode keeps working.
+    """
+    import subprocess  # noqa: PLC0415
+
+    out_path = "startup_profile.log" if target == "1" else target
+    env = {k: v for k, v in os.environ.items() if k != "SAPIENT_IMPORT_PROFILE"}
+    cmd = [sys.executable, "-X", "importtime", "-X", "faulthandler", "-m", "sapient_mcp", *sys.argv[1:]]
+    with open(out_path, "w", encoding="utf-8") as err:
+        return subprocess.call(cmd, stderr=err, env=env)
+
+
 def main() -> None:
-    parser = _build_arg_parser()
-    args = parser.parse_args()
+    profile = os.environ.get("SAPIENT_IMPORT_PROFILE")
+    if profile:
+        raise SystemExit(_run_import_profile(profile))
+
+    # Claude Desktop launches the stdio server with no flags: skip argparse then
+    if len(sys.argv) == 1:
+        args = CliArgs()
+    else:
+        args = _build_arg_parser().parse_args(namespace=CliArgs())
 
     # ── Build overrides dict from CLI args ────────────────────────────────────
-    overrides: dict = {}
-    if args.port is not None:
-        overrides["port"] = args.port
-    if args.host is not None:
-        overrides["host"] = args.host
-    if args.caps is not None:
-        overrides["caps"] = [c.strip() for c in args.caps.split(",") if c.strip()]
-    if args.saplogon_path is not None:
-        overrides["saplogon_path"] = args.saplogon_path
-    if args.sap_server is not None:
-        overrides["sap_server"] = args.sap_server
-    if args.output_dir is not None:
-        overrides["output_dir"] = args.output_dir
+    overrides: dict = {
+        attr: value for attr in _OVERRIDE_FLAGS if (value := getattr(args, attr)) is not None
+    }
     if args.no_screenshot_on_error:
         overrides["screenshot_on_error"] = False
 
     # ── Load config ───────────────────────────────────────────────────────────
-    from .config import load_config  # noqa: PLC0415
+    from .config import load_config_cached  # noqa: PLC0415
     try:
-        config = load_config(config_file=args.config, **overrides)
+        config = load_config_cached(config_file=args.config, **overrides)
     except FileNotFoundError as exc:
-        print(f"[sapient-mcp] ERROR: {exc}", file=sys.stderr)
-        sys.exit(1)
+        sys.stderr.write("[sapient-mcp] ERROR: ")
+        sys.stderr.write(str(exc))
+        sys.stderr.write("\n")
+        raise SystemExit(1) from None
 
-    _setup_logging(config.resolved_log_file())
+    # Logs also go to stderr if we're in SSE mode (port is set)
+    _setup_logging(config.resolved_log_file(), stderr=bool(config.port))
+    import logging  # noqa: PLC0415
     log = logging.getLogger("sapient_mcp")
 
-    # Add stderr handler if we're in SSE mode (port is set)
-    if config.port:
-        logging.getLogger().addHandler(logging.StreamHandler(sys.stderr))
-
-    log.info("=" * 60)
-    log.info("SAPient MCP Server starting")
-    log.info("  Transport : %s", f"SSE/HTTP :{config.port}" if config.port else "stdio")
-    log.info("  Caps      : %s", config.caps or "(core only)")
-    log.info("  Output    : %s", config.resolved_output_dir())
-    log.info("  SAP path  : %s", config.saplogon_path)
-    if config.sap_server:
-        log.info("  Auto-connect server: %s", config.sap_server)
-    log.info("=" * 60)
+    out_dir = config.resolved_output_dir()
+    if log.isEnabledFor(logging.INFO):
+        transport = f"SSE/HTTP :{config.port}" if config.port else "stdio"
+        caps_str = ", ".join(sorted(config.caps)) or "(core only)"
+        banner = "\n".join((
+            "=" * 60,
+            "SAPient MCP Server starting",
+            f"  Transport : {transport}",
+            f"  Caps      : {caps_str}",
+            f"  Output    : {out_dir}",
+            f"  SAP path  : {config.saplogon_path}",
+            *((f"  Auto-connect server: {config.sap_server}",) if config.sap_server else ()),
+            "=" * 60,
+        ))
+        log.info("%s", banner)
 
     # ── Initialise session manager ────────────────────────────────────────────
     from .session import SAPSessionManager  # noqa: PLC0415
-    SAPSessionManager.create(config.resolved_output_dir())
+    session = SAPSessionManager.create(out_dir)
 
+    # ── Build server; auto-connect (if configured) overlaps on the SAP worker ─
     from .server import build_server  # noqa: PLC0415
+    connect = session.submit(_auto_connect, config, log) if config.sap_server else None
     mcp = build_server(config)
-
-    # ── Auto-connect if configured ────────────────────────────────────────────
-    if config.sap_server:
-        _auto_connect(config, log)
+    _quiet_noisy_loggers()
+    if connect is not None:
+        connect.result()
 
     # ── Run ───────────────────────────────────────────────────────────────────
     if config.port:
@@ -139,25 +247,31 @@ def _auto_connect(config, log) -> None:
     """
     Optionally auto-open SAP and connect if sap_server is configured.
     Failures here are logged as warnings — the server still starts.
+    Runs on the session's SAP worker thread (see SAPSessionManager.submit).
     """
+    import logging  # noqa: PLC0415
+
     from .session import SAPError, SAPSessionManager, SessionState  # noqa: PLC0415
     session = SAPSessionManager.instance()
+    verbose = log.isEnabledFor(logging.INFO)
+    sap_server = config.sap_server
+    sap_user = config.sap_user
     try:
-        log.info("Auto-connecting to SAP server: %s", config.sap_server)
+        if verbose:
+            log.info("Auto-connecting to SAP server: %s", sap_server)
         session.execute("Open SAP", config.saplogon_path)
         session.set_state(SessionState.SAP_OPEN)
-        session.execute("Connect To Server", config.sap_server)
+        session.execute("Connect To Server", sap_server)
         session.set_state(SessionState.CONNECTED)
-        log.info("Auto-connect successful. SAP login screen is ready.")
+        if verbose:
+            log.info("Auto-connect successful. SAP login screen is ready.")
 
         # Auto-login if credentials are provided
-        if config.sap_client and config.sap_user and config.sap_password:
-            session.execute("Fill Text Field", "Client", config.sap_client)
-            session.execute("Fill Text Field", "User", config.sap_user)
-            session.execute("Fill Text Field", "Password", config.sap_password)
-            session.execute("Send SAP Keys", "Enter")
+        if config.sap_client and sap_user and config.sap_password:
+            session.execute("Fill Login Form", config.sap_client, sap_user, config.sap_password)
             session.set_state(SessionState.LOGGED_IN)
-            log.info("Auto-login completed as user '%s'.", config.sap_user)
+            if verbose:
+                log.info("Auto-login completed as user '%s'.", sap_user)
 
     except SAPError as exc:
         log.warning("Server is still running — use sap_open / sap_connect_to_server tools manually.")
@@ -8,15 +8,24 @@ All options are readable from:
 """
 from __future__ import annotations
 
+import functools
+import hashlib
 import json
 import os
+import pickle
+import sys
 from pathlib import Path
 from typing import Literal, Optional
 
-from pydantic import Field, field_validator
+from pydantic import Field, PrivateAttr, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+# Looked up once at import; load_config passes it as _env_file so
+# pydantic-settings doesn't stat .env again, and skips it when absent
+_ENV_FILE: Optional[str] = ".env" if os.path.isfile(".env") else None
+
+
 class RoboSAPiensMCPConfig(BaseSettings):
     model_config = SettingsConfigDict(
         env_prefix="SAPIENT_MCP_",
@@ -58,8 +67,8 @@ class RoboSAPiensMCPConfig(BaseSettings):
     )
 
     # ── Capabilities (opt-in feature sets) ────────────────────────────────────
-    caps: list[str] = Field(
-        default_factory=list,
+    caps: frozenset[str] = Field(
+        default_factory=frozenset,
         description="Extra capability sets: screenshot, codegen, advanced",
     )
 
@@ -82,6 +91,9 @@ class RoboSAPiensMCPConfig(BaseSettings):
         description="Language for code generation output",
     )
 
+    # Set by the first resolved_output_dir() call, which creates the directory
+    _resolved_dir: Optional[Path] = PrivateAttr(default=None)
+
     # ── Validators ────────────────────────────────────────────────────────────
     @field_validator("caps", mode="before")
     @classmethod
@@ -90,65 +102,147 @@ class RoboSAPiensMCPConfig(BaseSettings):
         Accept any of these formats from env vars or config files:
           - comma string : "screenshot,codegen,advanced"
           - JSON array   : ["screenshot","codegen","advanced"]
-          - Python list  : already a list
+          - Python list  : already a list (or set / frozenset)
         """
-        if isinstance(v, list):
-            return [c.strip() for c in v if c.strip()]
+        if isinstance(v, (list, tuple, set, frozenset)):
+            return _intern_caps(v)
         if isinstance(v, str):
             v = v.strip()
             if not v:
-                return []
+                return frozenset()
             # Try JSON array first e.g. '["screenshot","codegen"]'
             if v.startswith("["):
-                import json
                 try:
                     parsed = json.loads(v)
-                    return [c.strip() for c in parsed if c.strip()]
+                    return _intern_caps(parsed)
                 except json.JSONDecodeError:
                     pass
             # Fall back to comma-separated string
-            return [c.strip() for c in v.split(",") if c.strip()]
+            return _intern_caps(v.split(","))
         return v
 
     # ── Derived helpers ───────────────────────────────────────────────────────
-    @property
+    # cap_codegen is checked on every recorded tool call; cached_property
+    # turns each check into a plain instance-attribute read after the first.
+    @functools.cached_property
     def cap_screenshot(self) -> bool:
         return "screenshot" in self.caps
 
-    @property
+    @functools.cached_property
     def cap_codegen(self) -> bool:
         return "codegen" in self.caps
 
-    @property
+    @functools.cached_property
     def cap_advanced(self) -> bool:
         return "advanced" in self.caps
 
     def resolved_output_dir(self) -> Path:
-        p = Path(self.output_dir)
-        p.mkdir(parents=True, exist_ok=True)
+        p = self._resolved_dir
+        if p is None:
+            p = Path(self.output_dir)
+            p.mkdir(parents=True, exist_ok=True)
+            self._resolved_dir = p
         return p
 
     def resolved_log_file(self) -> Path:
         return self.resolved_output_dir() / self.log_file
 
 
+def _intern_caps(items) -> frozenset[str]:
+    return frozenset(sys.intern(c.strip()) for c in items if c.strip())
+
+
 def load_config(config_file: Optional[str] = None, **overrides) -> RoboSAPiensMCPConfig:
     """
     Load config from env/defaults, then overlay JSON file values,
     then overlay any explicit CLI overrides passed as kwargs.
+
+    The model is built once: pydantic-settings already ranks init kwargs
+    above env vars, .env and defaults, so merging file data and overrides
+    into the kwargs gives the same precedence as layering instances.
     """
-    base = RoboSAPiensMCPConfig()
+    merged: dict = {}
 
     if config_file:
         path = Path(config_file)
         if not path.exists():
             raise FileNotFoundError(f"Config file not found: {config_file}")
         with open(path) as f:
-            file_data = json.load(f)
-        # Re-instantiate with file values merged
-        base = RoboSAPiensMCPConfig(**{**base.model_dump(), **file_data})
+            merged.update(json.load(f))
+
+    merged.update(overrides)
+    return RoboSAPiensMCPConfig(_env_file=_ENV_FILE, **merged)
+
+
+# Bump when the pickled model's shape changes (fields or private attributes)
+_CACHE_FORMAT = 3
+
+
+def load_config_cached(config_file: Optional[str] = None, **overrides) -> RoboSAPiensMCPConfig:
+    """
+    load_config() backed by an on-disk pickle so frequent relaunches (Claude
+    Desktop restarts the server on every disconnect) skip JSON parsing and
+    validation. The cache key covers the config file path + mtime, the .env
+    file, all SAPIENT_MCP_* environment variables and the CLI overrides.
+    Configs that carry a password are never written to disk, and any cache
+    problem falls through to a plain load_config(). SAPIENT_CONFIG_CACHE=0
+    turns the cache off entirely.
+    """
+    if os.environ.get("SAPIENT_CONFIG_CACHE") == "0":
+        return load_config(config_file, **overrides)
+    try:
+        key = _config_cache_key(config_file, overrides)
+    except OSError:
+        return load_config(config_file, **overrides)
+
+    cache_file = _cache_dir() / "config.pkl"
+    try:
+        with open(cache_file, "rb") as f:
+            cached_key, cached = pickle.load(f)
+        if cached_key == key and isinstance(cached, RoboSAPiensMCPConfig):
+            return cached
+    except Exception:
+        pass
+
+    config = load_config(config_file, **overrides)
+    if not config.sap_password:
+        # Pickled before resolved_output_dir() runs, so every process still
+        # creates the output directory once
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "wb") as f:
+                pickle.dump((key, config), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, cache_file)
+        except Exception:
+            pass
+    return config
+
+
+def _config_cache_key(config_file: Optional[str], overrides: dict) -> str:
+    from . import __version__  # noqa: PLC0415
+
+    def _mtime(path: str) -> Optional[int]:
+        try:
+            return os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    parts = (
+        __version__,
+        _CACHE_FORMAT,
+        (os.path.abspath(config_file), os.stat(config_file).st_mtime_ns) if config_file else None,
+        (os.path.abspath(_ENV_FILE), _mtime(_ENV_FILE)) if _ENV_FILE else None,
+        sorted((k.upper(), v) for k, v in os.environ.items() if k.upper().startswith("SAPIENT_MCP_")),
+        # Sets have hash-seed-dependent repr order; sort them for a stable key
+        sorted((k, sorted(v) if isinstance(v, (set, frozenset)) else v) for k, v in overrides.items()),
+    )
+    return hashlib.blake2b(repr(parts).encode()).hexdigest()
 
-    if overrides:
-        base = RoboSAPiensMCPConfig(**{**base.model_dump(), **overrides})
 
-    return base
\ No newline at end of file
+def _cache_dir() -> Path:
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser(r"~\AppData\Local")
+        return Path(base) / "sapient-mcp" / "Cache"
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return Path(base) / "sapient-mcp"
@@ -0,0 +1,62 @@
+"""
+Logging handlers used by the SAPient MCP entry point.
+
+Imported lazily from __main__._setup_logging so `--help` / `--version`
+never pay for the logging machinery.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+
+
+class BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler that writes through a large buffer instead of flushing after
+    every record. A daemon thread flushes every `flush_interval` seconds, and
+    close() (called by logging.shutdown at exit) flushes whatever is left.
+    """
+
+    def __init__(
+        self,
+        filename,
+        mode: str = "a",
+        encoding: str | None = None,
+        *,
+        buffer_size: int = 128 * 1024,
+        flush_interval: float = 0.5,
+    ):
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        super().__init__(filename, mode, encoding)
+        self._stop_flusher = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="sapient-log-flush", daemon=True
+        )
+        self._flusher.start()
+
+    def _open(self):
+        return open(
+            self.baseFilename,
+            self.mode,
+            buffering=self.buffer_size,
+            encoding=self.encoding,
+            errors=self.errors,
+        )
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Same as FileHandler.emit minus the per-record flush()
+        if self.stream is None:
+            self.stream = self._open()
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+    def _flush_loop(self) -> None:
+        while not self._stop_flusher.wait(self.flush_interval):
+            self.flush()
+
+    def close(self) -> None:
+        self._stop_flusher.set()
+        super().close()
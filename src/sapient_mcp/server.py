@@ -7,60 +7,140 @@ Mutating tools: change SAP state (fill fields, click buttons, etc.)
 """
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
 import logging
-from typing import Annotated, Any, Optional
+from typing import Annotated, Any, Literal, Optional
 
 from mcp.server.fastmcp import FastMCP
 from pydantic import Field
 
 from .config import RoboSAPiensMCPConfig
-from .session import SAPError, SAPSessionManager, SessionState
+from .session import SAPError, SAPSessionManager, SessionState, state_error, state_mask
+
+try:
+    import orjson
+except ImportError:  # optional speed-up: pip install sapient-mcp[fast]
+    orjson = None
 
 log = logging.getLogger("sapient_mcp.server")
 
 
 # ── Helpers ────────────────────────────────────────────────────────────────────
 
-def _ok(msg: str, **extra) -> str:
+def _json(obj: Any, *, indent: bool = False) -> str:
+    """Serialise a tool response — orjson when installed, stdlib json otherwise."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    return json.dumps(obj, default=str, ensure_ascii=False, indent=2 if indent else None)
+
+
+# Shared tool parameter types — built once instead of per tool signature
+_RowLocator = Annotated[str, Field(description="Row number or a cell value in that row")]
+_ColumnName = Annotated[str, Field(description="Column header title")]
+_TextFieldLabel = Annotated[str, Field(description="Visible label of the text field")]
+_CheckboxLabel = Annotated[str, Field(description="Visible label of the checkbox")]
+_Direction = Literal["down", "up"]
+
+# Field labels whose values are masked in the generated script
+_PASSWORD_LABELS: frozenset[str] = frozenset({"password", "passwort", "kennwort", "mot de passe", "contraseña"})
+
+# sap_fill_form checkbox values; anything else is rejected rather than guessed
+_CHECKED_VALUES: frozenset[str] = frozenset({"true", "1", "yes", "x"})
+_UNCHECKED_VALUES: frozenset[str] = frozenset({"false", "0", "no", ""})
+
+
+def _ok(msg: str) -> str:
     """Standard success response — plain text for LLM."""
-    if extra:
-        return f"{msg}\n{json.dumps(extra, indent=2)}"
     return msg
 
 
-def _err(exc: SAPError, screenshot_b64: Optional[str] = None) -> str:
-    """Format a SAPError as a rich text response the LLM can act on."""
+def _ok_extra(msg: str, extra: dict[str, Any]) -> str:
+    """Success response followed by a JSON block of extra fields."""
+    return f"{msg}\n{_json(extra, indent=True)}"
+
+
+def _err(exc: SAPError) -> str:
+    """
+    Format a SAPError as a rich text response the LLM can act on,
+    including the note left by _queue_error_screenshot, if any.
+    """
     parts = [f"ERROR: {exc}"]
     if exc.keyword:
         parts.append(f"Keyword: {exc.keyword}")
     if exc.hint:
         parts.append(f"Hint: {exc.hint}")
-    if screenshot_b64:
-        parts.append("[Screenshot captured — see image content below]")
+    if exc.screenshot_note:
+        parts.append(exc.screenshot_note)
     return "\n".join(parts)
 
 
+_SCREENSHOT_NOTE = "[Error screenshot is being saved to the output directory]"
+_SCREENSHOT_NOTE_TOOL = (
+    "[Error screenshot is being saved to the output directory — "
+    "sap_get_last_screenshot reports its file path]"
+)
+
+
+def _queue_error_screenshot(
+    session: SAPSessionManager,
+    config: RoboSAPiensMCPConfig,
+    exc: SAPError,
+    label: str = "error",
+) -> None:
+    """
+    Queue a background screenshot of a failed tool and note it on `exc`.
+    The capture runs on the SAP worker after the tool returns. Skipped when
+    RoboSAPiens never loaded: there is no SAP window to capture then.
+    """
+    if config.screenshot_on_error and session.lib_loaded:
+        session.capture_screenshot_async(label)
+        exc.screenshot_note = _SCREENSHOT_NOTE_TOOL if config.cap_screenshot else _SCREENSHOT_NOTE
+
+
 def _run(
     session: SAPSessionManager,
     config: RoboSAPiensMCPConfig,
     keyword: str,
     *args: Any,
     record: bool = True,
-) -> tuple[Any, Optional[str]]:
+) -> Any:
     """
-    Execute a keyword, capturing screenshot on failure.
-    Returns (result, screenshot_b64_or_None).
+    Execute a keyword and return its result, queueing an error screenshot
+    on failure (see _queue_error_screenshot).
     Raises SAPError on failure (caller decides how to surface).
     """
     try:
         result = session.execute(keyword, *args)
         if record and config.cap_codegen:
             session.record(keyword, *args)
-        return result, None
+        return result
+    except SAPError as exc:
+        _queue_error_screenshot(session, config, exc)
+        raise exc from exc.__cause__  # re-raise; _err reports the screenshot
+
+
+def _run_linked(
+    session: SAPSessionManager,
+    config: RoboSAPiensMCPConfig,
+    *calls: tuple,
+) -> list[Any]:
+    """
+    Like _run, for a mutating call followed by dependent read calls
+    (see SAPSessionManager.execute_linked). Only the first call is recorded,
+    and it is recorded even if a later read fails.
+    """
+    try:
+        results = session.execute_linked(*calls)
+        if config.cap_codegen:
+            session.record(*calls[0])
+        return results
     except SAPError as exc:
-        ss = session.take_screenshot("error") if config.screenshot_on_error else None
-        raise exc from exc.__cause__  # re-raise; caller will attach ss
+        if config.cap_codegen and exc.completed:
+            session.record(*calls[0])
+        _queue_error_screenshot(session, config, exc)
+        raise exc from exc.__cause__  # re-raise; _err reports the screenshot
 
 
 # ── Server factory ─────────────────────────────────────────────────────────────
@@ -70,18 +150,48 @@ def build_server(config: RoboSAPiensMCPConfig) -> FastMCP:
         "sapient",
         instructions=(
             "SAPient MCP lets you automate SAP GUI using natural language. "
-            "Always call sap_get_window_title or sap_get_snapshot (if available) "
-            "to understand the current state before performing actions. "
+            "Always call sap_get_snapshot (if available — it returns title, status bar and state "
+            "in one call) or sap_get_window_title to understand the current state before performing actions. "
             "Use sap_read_status_bar after Save/Post operations to confirm success."
         ),
     )
     session = SAPSessionManager.instance()
 
+    def sap_tool(**kwargs):
+        """
+        mcp.tool() for a sync tool body: registers an async wrapper that runs
+        the body on the SAP worker thread, keeping the event loop responsive.
+        """
+        def register(fn):
+            @functools.wraps(fn)
+            async def run_on_worker(*args, **kw):
+                return await asyncio.wrap_future(session.submit(fn, *args, **kw))
+            mcp.tool(**kwargs)(run_on_worker)
+            return fn
+        return register
+
+    def requires(min_state: SessionState):
+        """
+        Guard a tool body: answer with the state error (formatted once, here)
+        unless the session has reached `min_state`.
+        """
+        denied = _err(state_error(min_state))
+        mask = state_mask(min_state)
+
+        def guard(fn):
+            @functools.wraps(fn)
+            def checked(*args, **kwargs):
+                if not session._state_bits & mask:
+                    return denied
+                return fn(*args, **kwargs)
+            return checked
+        return guard
+
     # ═══════════════════════════════════════════════════════════════════════════
     # CATEGORY 1 — SESSION MANAGEMENT
     # ═══════════════════════════════════════════════════════════════════════════
 
-    @mcp.tool(
+    @sap_tool(
         name="sap_open",
         description=(
             "Launch SAP Logon (saplogon.exe). Must be called before sap_connect_to_server. "
@@ -102,7 +212,7 @@ def build_server(config: RoboSAPiensMCPConfig) -> FastMCP:
         except SAPError as exc:
             return _err(exc)
 
-    @mcp.tool(
+    @sap_tool(
         name="sap_connect_to_server",
         description=(
             "Connect to an SAP server using the description shown in the SAP Logon list. "
@@ -126,7 +236,7 @@ def build_server(config: RoboSAPiensMCPConfig) -> FastMCP:
         except SAPError as exc:
             return _err(exc)
 
-    @mcp.tool(
+    @sap_tool(
         name="sap_connect_to_running",
         description=(
             "Attach to an already-running SAP GUI session. "
@@ -144,7 +254,7 @@ def build_server(config: RoboSAPiensMCPConfig) -> FastMCP:
         except SAPError as exc:
             return _err(exc)
 
-    @mcp.tool(
+    @sap_tool(
         name="sap_get_session_info",
         description="Return current session state, window title, and connection info. Read-only — safe to call anytime.",
     )
@@ -160,9 +270,9 @@ def build_server(config: RoboSAPiensMCPConfig) -> FastMCP:
                 info["window_title"] = session.execute("Get Window Title")
             except SAPError:
                 info["window_title"] = "unavailable"
-        return json.dumps(info, indent=2)
+        return _json(info, indent=True)
 
-    @mcp.tool(
+    @sap_tool(
         name="sap_close",
         description="Close the SAP GUI application. Ends the SAP session.",
     )
@@ -181,7 +291,7 @@ def build_server(config: RoboSAPiensMCPConfig) -> FastMCP:
     # CATEGORY 2 — NAVIGATION
     # ═══════════════════════════════════════════════════════════════════════════
 
-    @mcp.tool(
+    @sap_tool(
         name="sap_execute_transaction",
         description=(
             "Execute a SAP transaction code. "
@@ -189,66 +299,69 @@ def build_server(config: RoboSAPiensMCPConfig) -> FastMCP:
             "Use /o prefix to open in a new session window."
         ),
     )
+    @requires(SessionState.LOGGED_IN)
     def sap_execute_transaction(
         transaction_code: Annotated[
             str,
             Field(description="Transaction code, e.g. 'ME21N', '/nSE16', '/nMB52'"),
         ],
     ) -> str:
-        session.require_logged_in()
         try:
-            result, _ = _run(session, config, "Execute Transaction", transaction_code)
-            title = session.execute("Get Window Title")
-            return _ok(f"Transaction '{transaction_code}' executed.", window_title=title)
+            _, title = _run_linked(
+                session, config, ("Execute Transaction", transaction_code), ("Get Window Title",)
+            )
+            return _ok_extra(f"Transaction '{transaction_code}' executed.", {"window_title": title})
         except SAPError as exc:
             return _err(exc)
 
-    @mcp.tool(
+    @sap_tool(
         name="sap_activate_tab",
         description="Click on a tab in the current SAP screen by its visible label text.",
     )
+    @requires(SessionState.LOGGED_IN)
     def sap_activate_tab(
         tab_label: Annotated[str, Field(description="The visible text label of the tab")],
     ) -> str:
-        session.require_logged_in()
         try:
             _run(session, config, "Activate Tab", tab_label)
             return _ok(f"Tab '{tab_label}' activated.")
         except SAPError as exc:
             return _err(exc)
 
-    @mcp.tool(
+    @sap_tool(
         name="sap_get_window_title",
-        description="Return the title of the current SAP window. Read-only. Use to confirm navigation.",
+        description=(
+            "Return the title of the current SAP window. Read-only. Use to confirm navigation. "
+            "When sap_get_snapshot is available, prefer it — it also returns the status bar."
+        ),
     )
     def sap_get_window_title() -> str:
         try:
-            title = session.execute("Get Window Title", record=False) if False else session.execute("Get Window Title")
-            return title or "(empty title)"
+            return session.execute("Get Window Title") or "(empty title)"
         except SAPError as exc:
             return _err(exc)
 
-    @mcp.tool(
+    @sap_tool(
         name="sap_select_menu_item",
         description=(
             "Navigate the SAP menu bar. Provide the full path as separate arguments, "
             "e.g. path=['Goto', 'Back'] or path=['Edit', 'Select All']."
         ),
     )
+    @requires(SessionState.LOGGED_IN)
     def sap_select_menu_item(
         path: Annotated[
             list[str],
             Field(description="Menu path as a list of labels, e.g. ['Edit', 'Select All']"),
         ],
     ) -> str:
-        session.require_logged_in()
         try:
             _run(session, config, "Select Menu Item", *path)
             return _ok(f"Menu item selected: {' → '.join(path)}")
         except SAPError as exc:
             return _err(exc)
 
-    @mcp.tool(
+    @sap_tool(
         name="sap_send_key",
         description=(
             "Send a SAP GUI keyboard key. "
@@ -256,10 +369,10 @@ def build_server(config: RoboSAPiensMCPConfig) -> FastMCP:
             "PageDown, PageUp, Tab, Escape, Save (Ctrl+S equivalent)."
         ),
     )
+    @requires(SessionState.LOGGED_IN)
     def sap_send_key(
         key: Annotated[str, Field(description="Key name: Enter, F3, F8, PageDown, PageUp, Tab, Escape, Save")],
     ) -> str:
-        session.require_logged_in()
         try:
             _run(session, config, "Send SAP Keys", key)
             return _ok(f"Key sent: {key}")
@@ -270,7 +383,7 @@ def build_server(config: RoboSAPiensMCPConfig) -> FastMCP:
     # CATEGORY 3 — FORM INPUT
     # ═══════════════════════════════════════════════════════════════════════════
 
-    @mcp.tool(
+    @sap_tool(
         name="sap_fill_text_field",
         description=(
             "Fill a text input field in SAP GUI identified by its visible label. "
@@ -278,167 +391,236 @@ def build_server(config: RoboSAPiensMCPConfig) -> FastMCP:
             "Password fields are automatically masked in logs."
         ),
     )
+    @requires(SessionState.CONNECTED)
     def sap_fill_text_field(
         label: Annotated[str, Field(description="Visible label of the text field as shown in SAP")],
         value: Annotated[str, Field(description="Value to enter into the field")],
     ) -> str:
-        session.require_connected()
-        ss = None
         try:
             session.execute("Fill Text Field", label, value)
             # Redact password from codegen script
-            record_value = "***" if label.lower() in ("password", "passwort", "kennwort") else value
+            record_value = "***" if label.lower() in _PASSWORD_LABELS else value
             if config.cap_codegen:
                 session.record("Fill Text Field", label, record_value)
             return _ok(f"Field '{label}' filled.")
         except SAPError as exc:
-            if config.screenshot_on_error:
-                ss = session.take_screenshot("fill_error")
-            return _err(exc, ss)
+            _queue_error_screenshot(session, config, exc, "fill_error")
+            return _err(exc)
 
-    @mcp.tool(
+    @sap_tool(
         name="sap_clear_text_field",
         description="Clear the contents of a text field identified by its visible label.",
     )
+    @requires(SessionState.LOGGED_IN)
     def sap_clear_text_field(
-        label: Annotated[str, Field(description="Visible label of the text field")],
+        label: _TextFieldLabel,
     ) -> str:
-        session.require_logged_in()
         try:
             _run(session, config, "Clear Text Field", label)
             return _ok(f"Field '{label}' cleared.")
         except SAPError as exc:
             return _err(exc)
 
-    @mcp.tool(
+    @sap_tool(
         name="sap_set_checkbox",
         description="Check (tick) a checkbox in SAP GUI identified by its visible label.",
     )
+    @requires(SessionState.LOGGED_IN)
     def sap_set_checkbox(
-        label: Annotated[str, Field(description="Visible label of the checkbox")],
+        label: _CheckboxLabel,
     ) -> str:
-        session.require_logged_in()
         try:
             _run(session, config, "Set Checkbox", label)
             return _ok(f"Checkbox '{label}' checked.")
         except SAPError as exc:
             return _err(exc)
 
-    @mcp.tool(
+    @sap_tool(
         name="sap_unset_checkbox",
         description="Uncheck a checkbox in SAP GUI identified by its visible label.",
     )
+    @requires(SessionState.LOGGED_IN)
     def sap_unset_checkbox(
-        label: Annotated[str, Field(description="Visible label of the checkbox")],
+        label: _CheckboxLabel,
     ) -> str:
-        session.require_logged_in()
         try:
             _run(session, config, "Unset Checkbox", label)
             return _ok(f"Checkbox '{label}' unchecked.")
         except SAPError as exc:
             return _err(exc)
 
-    @mcp.tool(
+    @sap_tool(
         name="sap_select_radio_button",
         description="Select a radio button in SAP GUI identified by its visible label.",
     )
+    @requires(SessionState.LOGGED_IN)
     def sap_select_radio_button(
         label: Annotated[str, Field(description="Visible label of the radio button")],
     ) -> str:
-        session.require_logged_in()
         try:
             _run(session, config, "Select Radio Button", label)
             return _ok(f"Radio button '{label}' selected.")
         except SAPError as exc:
             return _err(exc)
 
+    @sap_tool(
+        name="sap_fill_form",
+        description=(
+            "Fill several form inputs in one call — much faster than one tool call per field. "
+            "Each entry has 'kind' and the keys that kind needs: "
+            "text → label, value; checkbox → label, value ('true'/'false'); "
+            "radio → label; cell → row, column, value. "
+            "Steps run in order and stop at the first failure."
+        ),
+    )
+    @requires(SessionState.CONNECTED)
+    def sap_fill_form(
+        fields: Annotated[
+            list[dict[str, str]],
+            Field(description="Entries like {'kind': 'text', 'label': 'Vendor', 'value': '1000'}"),
+        ],
+    ) -> str:
+        steps: list[tuple[str, tuple]] = []
+        records: list[tuple[str, tuple]] = []
+        # text only needs a connection (login screen); the other kinds use
+        # keywords whose own tools require LOGGED_IN
+        needs_login = False
+        for i, entry in enumerate(fields, 1):
+            kind = entry.get("kind", "text")
+            try:
+                if kind == "text":
+                    label, value = entry["label"], entry["value"]
+                    steps.append(("Fill Text Field", (label, value)))
+                    # Redact password from codegen script
+                    record_value = "***" if label.lower() in _PASSWORD_LABELS else value
+                    records.append(("Fill Text Field", (label, record_value)))
+                    continue
+                if kind == "checkbox":
+                    flag = entry.get("value", "true").strip().lower()
+                    if flag in _CHECKED_VALUES:
+                        step = ("Set Checkbox", (entry["label"],))
+                    elif flag in _UNCHECKED_VALUES:
+                        step = ("Unset Checkbox", (entry["label"],))
+                    else:
+                        return (
+                            f"ERROR: field {i}: checkbox value '{entry['value']}' is not a boolean "
+                            "(use true/1/yes/x or false/0/no)"
+                        )
+                elif kind == "radio":
+                    step = ("Select Radio Button", (entry["label"],))
+                elif kind == "cell":
+                    step = ("Fill Cell", (entry["row"], entry["column"], entry["value"]))
+                else:
+                    return f"ERROR: field {i}: unknown kind '{kind}' (expected text, checkbox, radio or cell)"
+            except KeyError as exc:
+                return f"ERROR: field {i} ({kind}) is missing key {exc}"
+            needs_login = True
+            steps.append(step)
+            records.append(step)
+
+        if needs_login and not session.is_logged_in():
+            return _err(state_error(SessionState.LOGGED_IN))
+
+        try:
+            session.execute_batch(steps)
+            if config.cap_codegen:
+                session.record_batch(records)
+            return _ok(f"{len(steps)} field(s) filled.")
+        except SAPError as exc:
+            # Steps before the failing one did run in SAP; keep them in the script
+            if config.cap_codegen and exc.completed:
+                session.record_batch(records[:exc.completed])
+            _queue_error_screenshot(session, config, exc, "fill_error")
+            return _err(exc)
+
     # ═══════════════════════════════════════════════════════════════════════════
     # CATEGORY 4 — ACTIONS (Buttons)
     # ═══════════════════════════════════════════════════════════════════════════
 
-    @mcp.tool(
+    @sap_tool(
         name="sap_push_button",
         description=(
             "Click a button in SAP GUI identified by its visible label or tooltip. "
             "Common buttons: Save, Enter, Back, Cancel, Execute, Yes, No, Continue."
         ),
     )
+    @requires(SessionState.CONNECTED)
     def sap_push_button(
         label: Annotated[str, Field(description="Visible label or tooltip of the button")],
     ) -> str:
-        session.require_connected()
         try:
             _run(session, config, "Push Button", label)
             return _ok(f"Button '{label}' clicked.")
         except SAPError as exc:
-            ss = session.take_screenshot("button_error") if config.screenshot_on_error else None
-            return _err(exc, ss)
+            return _err(exc)  # _run already queued the error screenshot
 
-    @mcp.tool(
+    @sap_tool(
         name="sap_button_exists",
         description=(
             "Check whether a button with the given label exists on the current screen. "
             "Returns true/false. Use this for conditional logic before pushing buttons."
         ),
     )
+    @requires(SessionState.LOGGED_IN)
     def sap_button_exists(
         label: Annotated[str, Field(description="Visible label or tooltip of the button to check")],
     ) -> str:
-        session.require_logged_in()
+        # Button Exists itself never raises on a missing button; this only
+        # catches setup failures such as RoboSAPiens not being installed
         try:
-            session.execute("Highlight Button", label)
-            return json.dumps({"exists": True, "label": label})
-        except SAPError:
-            return json.dumps({"exists": False, "label": label})
+            exists = session.execute("Button Exists", label)
+            return _json({"exists": exists, "label": label})
+        except SAPError as exc:
+            return _err(exc)
 
     # ═══════════════════════════════════════════════════════════════════════════
     # CATEGORY 5 — READ / INSPECT (read-only)
     # ═══════════════════════════════════════════════════════════════════════════
 
-    @mcp.tool(
+    @sap_tool(
         name="sap_read_text_field",
         description=(
             "Read the current value of a text field identified by its visible label. "
             "Read-only — does not modify SAP state."
         ),
     )
+    @requires(SessionState.LOGGED_IN)
     def sap_read_text_field(
-        label: Annotated[str, Field(description="Visible label of the text field")],
+        label: _TextFieldLabel,
     ) -> str:
-        session.require_logged_in()
         try:
             value = session.execute("Read Text Field", label)
-            return json.dumps({"label": label, "value": value})
+            return _json({"label": label, "value": value})
         except SAPError as exc:
             return _err(exc)
 
-    @mcp.tool(
+    @sap_tool(
         name="sap_read_text",
         description="Read the text content of any SAP element (label, status message, etc.) by its identifier.",
     )
+    @requires(SessionState.LOGGED_IN)
     def sap_read_text(
         locator: Annotated[str, Field(description="Label or identifier of the SAP text element")],
     ) -> str:
-        session.require_logged_in()
         try:
             value = session.execute("Read Text", locator)
-            return json.dumps({"locator": locator, "value": value})
+            return _json({"locator": locator, "value": value})
         except SAPError as exc:
             return _err(exc)
 
-    @mcp.tool(
+    @sap_tool(
         name="sap_read_status_bar",
         description=(
             "Read the SAP status bar message at the bottom of the window. "
             "Always call this after Save/Post operations to confirm success or get error details. "
-            "Read-only."
+            "Read-only. When sap_get_snapshot is available, prefer it — it also returns the window title."
         ),
     )
+    @requires(SessionState.LOGGED_IN)
     def sap_read_status_bar() -> str:
-        session.require_logged_in()
         try:
             msg = session.execute("Read Status Bar")
-            return json.dumps({"status_bar": msg or "(empty)"})
+            return _json({"status_bar": msg or "(empty)"})
         except SAPError as exc:
             return _err(exc)
 
@@ -446,96 +628,95 @@ def build_server(config: RoboSAPiensMCPConfig) -> FastMCP:
     # CATEGORY 6 — TABLE OPERATIONS
     # ═══════════════════════════════════════════════════════════════════════════
 
-    @mcp.tool(
+    @sap_tool(
         name="sap_count_table_rows",
         description="Return the total number of rows in the currently visible table. Read-only.",
     )
+    @requires(SessionState.LOGGED_IN)
     def sap_count_table_rows() -> str:
-        session.require_logged_in()
         try:
             count = session.execute("Count Table Rows")
-            return json.dumps({"row_count": count})
+            return _json({"row_count": count})
         except SAPError as exc:
             return _err(exc)
 
-    @mcp.tool(
+    @sap_tool(
         name="sap_select_table_row",
         description=(
             "Select a row in the SAP table. "
             "Identify by row number (1-based integer) or by a cell value in that row."
         ),
     )
+    @requires(SessionState.LOGGED_IN)
     def sap_select_table_row(
         row_locator: Annotated[
             str,
             Field(description="Row number as string (e.g. '1') or cell value in that row (e.g. 'P.O.-12345')"),
         ],
     ) -> str:
-        session.require_logged_in()
         try:
             _run(session, config, "Select Table Row", row_locator)
             return _ok(f"Table row '{row_locator}' selected.")
         except SAPError as exc:
             return _err(exc)
 
-    @mcp.tool(
+    @sap_tool(
         name="sap_read_table_cell",
         description="Read the value of a specific table cell. Identify row by number or cell value; column by its header.",
     )
+    @requires(SessionState.LOGGED_IN)
     def sap_read_table_cell(
-        row_locator: Annotated[str, Field(description="Row number or a cell value in that row")],
-        column_name: Annotated[str, Field(description="Column header title")],
+        row_locator: _RowLocator,
+        column_name: _ColumnName,
     ) -> str:
-        session.require_logged_in()
         try:
             value = session.execute("Read Table Cell", row_locator, column_name)
-            return json.dumps({"row": row_locator, "column": column_name, "value": value})
+            return _json({"row": row_locator, "column": column_name, "value": value})
         except SAPError as exc:
             return _err(exc)
 
-    @mcp.tool(
+    @sap_tool(
         name="sap_fill_cell",
         description="Fill a table cell with a value. Identify by row locator and column name.",
     )
+    @requires(SessionState.LOGGED_IN)
     def sap_fill_cell(
-        row_locator: Annotated[str, Field(description="Row number or a cell value in that row")],
-        column_name: Annotated[str, Field(description="Column header title")],
+        row_locator: _RowLocator,
+        column_name: _ColumnName,
         value: Annotated[str, Field(description="Value to enter in the cell")],
     ) -> str:
-        session.require_logged_in()
         try:
             _run(session, config, "Fill Cell", row_locator, column_name, value)
             return _ok(f"Cell [{row_locator}, {column_name}] filled with '{value}'.")
         except SAPError as exc:
             return _err(exc)
 
-    @mcp.tool(
+    @sap_tool(
         name="sap_double_click_cell",
         description="Double-click a table cell to open detail / trigger drill-down.",
     )
+    @requires(SessionState.LOGGED_IN)
     def sap_double_click_cell(
-        row_locator: Annotated[str, Field(description="Row number or a cell value in that row")],
-        column_name: Annotated[str, Field(description="Column header title")],
+        row_locator: _RowLocator,
+        column_name: _ColumnName,
     ) -> str:
-        session.require_logged_in()
         try:
-            _run(session, config, "Double Click Cell", row_locator, column_name)
-            title = session.execute("Get Window Title")
-            return _ok(f"Double-clicked cell [{row_locator}, {column_name}].", window_title=title)
+            _, title = _run_linked(
+                session, config, ("Double Click Cell", row_locator, column_name), ("Get Window Title",)
+            )
+            return _ok_extra(f"Double-clicked cell [{row_locator}, {column_name}].", {"window_title": title})
         except SAPError as exc:
             return _err(exc)
 
-    @mcp.tool(
+    @sap_tool(
         name="sap_scroll_table",
         description="Scroll the SAP table up or down by a number of rows.",
     )
+    @requires(SessionState.LOGGED_IN)
     def sap_scroll_table(
-        direction: Annotated[str, Field(description="Scroll direction: 'down' or 'up'")],
+        direction: Annotated[_Direction, Field(description="Scroll direction")],
         rows: Annotated[int, Field(default=1, ge=1, description="Number of rows to scroll")] = 1,
     ) -> str:
-        session.require_logged_in()
-        if direction not in ("down", "up"):
-            return "ERROR: direction must be 'down' or 'up'"
         try:
             _run(session, config, "Scroll Table", direction, str(rows))
             return _ok(f"Table scrolled {direction} by {rows} row(s).")
@@ -548,7 +729,7 @@ def build_server(config: RoboSAPiensMCPConfig) -> FastMCP:
 
     if config.cap_screenshot:
 
-        @mcp.tool(
+        @sap_tool(
             name="sap_take_screenshot",
             description=(
                 "Capture a screenshot of the current SAP window. "
@@ -562,11 +743,29 @@ def build_server(config: RoboSAPiensMCPConfig) -> FastMCP:
                 Field(default="screenshot", description="Label prefix for the saved file"),
             ] = "screenshot",
         ) -> str:
-            b64 = session.take_screenshot(label)
-            if b64 is None:
+            shot = session.take_screenshot(label)
+            if shot is None:
                 return "ERROR: Screenshot capture failed."
-            out_dir = config.resolved_output_dir()
-            return _ok(f"Screenshot captured and saved to {out_dir}.", base64_length=len(b64))
+            path, b64 = shot
+            return _ok_extra(f"Screenshot saved to {path}.", {"path": path, "base64_length": len(b64)})
+
+        @mcp.tool(
+            name="sap_get_last_screenshot",
+            description=(
+                "Return the file path of the screenshot captured in the background after the "
+                "most recent tool error. Waits for the capture to finish if it is still running. Read-only."
+            ),
+        )
+        async def sap_get_last_screenshot() -> str:
+            pending = session.last_error_screenshot
+            if pending is None:
+                return "No error screenshot has been captured in this session."
+            # Plain async tool: the capture itself runs on the SAP worker thread
+            shot = await asyncio.wrap_future(pending)
+            if shot is None:
+                return "ERROR: Screenshot capture failed."
+            path, b64 = shot
+            return _ok_extra(f"Error screenshot saved to {path}.", {"path": path, "base64_length": len(b64)})
 
     # ═══════════════════════════════════════════════════════════════════════════
     # CATEGORY 8 — CODE GENERATION (opt-in: --caps codegen)
@@ -574,7 +773,7 @@ def build_server(config: RoboSAPiensMCPConfig) -> FastMCP:
 
     if config.cap_codegen:
 
-        @mcp.tool(
+        @sap_tool(
             name="sap_get_generated_script",
             description=(
                 "Return the Robot Framework test script accumulated from all actions "
@@ -584,7 +783,7 @@ def build_server(config: RoboSAPiensMCPConfig) -> FastMCP:
         def sap_get_generated_script() -> str:
             return session.get_script()
 
-        @mcp.tool(
+        @sap_tool(
             name="sap_clear_script",
             description="Clear the accumulated Robot Framework script and start fresh.",
         )
@@ -598,11 +797,12 @@ def build_server(config: RoboSAPiensMCPConfig) -> FastMCP:
 
     if config.cap_advanced:
 
-        @mcp.tool(
+        @sap_tool(
             name="sap_get_snapshot",
             description=(
                 "Return a structured JSON snapshot of the current SAP window: "
-                "window title, status bar, state. "
+                "window title, status bar, session state and server — in one call. "
+                "Prefer this over calling sap_get_window_title + sap_read_status_bar separately. "
                 "Use this to understand what's on screen before performing actions. "
                 "Analogous to Playwright's browser_snapshot. Read-only."
             ),
@@ -610,7 +810,7 @@ def build_server(config: RoboSAPiensMCPConfig) -> FastMCP:
         def sap_get_snapshot() -> str:
             try:
                 snap = session.get_snapshot()
-                return json.dumps(snap, indent=2)
+                return _json(snap, indent=True)
             except SAPError as exc:
                 return _err(exc)
 
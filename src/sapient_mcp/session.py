@@ -7,37 +7,86 @@ keeps one browser context alive across all tool calls).
 """
 from __future__ import annotations
 
-import base64
+import binascii
+import io
+import itertools
 import logging
+import os
+import re
 import threading
 import time
-from datetime import datetime
-from enum import Enum, auto
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import IntFlag
 from pathlib import Path
 from typing import Any, Optional
 
 log = logging.getLogger("sapient_mcp.session")
 
+# "Fill Text Field" → "fill_text_field" in one C-level pass (keywords are ASCII)
+_KW_TRANS = str.maketrans(" ABCDEFGHIJKLMNOPQRSTUVWXYZ", "_abcdefghijklmnopqrstuvwxyz")
 
-class SessionState(Enum):
-    DISCONNECTED = auto()
-    SAP_OPEN = auto()       # saplogon.exe launched, not yet connected
-    CONNECTED = auto()      # Connected to server, at login screen
-    LOGGED_IN = auto()      # Fully logged in, in SAP application
+
+class SessionState(IntFlag):
+    DISCONNECTED = 0
+    SAP_OPEN = 1            # saplogon.exe launched, not yet connected
+    CONNECTED = 2           # Connected to server, at login screen
+    LOGGED_IN = 4           # Fully logged in, in SAP application
+
+
+# State guards AND plain ints: IntFlag.__and__ builds a new enum member
+_CONNECTED_MASK = int(SessionState.CONNECTED | SessionState.LOGGED_IN)
+_LOGGED_IN_MASK = int(SessionState.LOGGED_IN)
 
 
 class SAPError(Exception):
     """Wrapper for SAP-level errors with structured info for LLM responses."""
+    __slots__ = ("hint", "keyword", "screenshot_note", "completed")
+
     def __init__(self, message: str, hint: str = "", keyword: str = ""):
         super().__init__(message)
         self.hint = hint
         self.keyword = keyword
+        # Set when a background error screenshot was queued for this failure
+        self.screenshot_note = ""
+        # Multi-step calls: how many steps succeeded before this one failed
+        self.completed = 0
 
     def to_dict(self) -> dict:
-        d = {"error": str(self), "keyword": self.keyword}
         if self.hint:
-            d["hint"] = self.hint
-        return d
+            return {"error": str(self), "keyword": self.keyword, "hint": self.hint}
+        return {"error": str(self), "keyword": self.keyword}
+
+
+# Minimum session state a tool can require → (message, hint) when it isn't met
+_STATE_REQUIREMENTS: dict[SessionState, tuple[str, str]] = {
+    SessionState.CONNECTED: (
+        "No active SAP connection",
+        "Call sap_open → sap_connect_to_server (or sap_connect_to_running) first.",
+    ),
+    SessionState.LOGGED_IN: (
+        "Not logged in to SAP",
+        "Complete login with sap_fill_text_field / sap_push_button, then the session auto-detects login.",
+    ),
+}
+
+
+# Minimum session state → bitmask of the states that satisfy it
+_STATE_MASKS: dict[SessionState, int] = {
+    SessionState.CONNECTED: _CONNECTED_MASK,
+    SessionState.LOGGED_IN: _LOGGED_IN_MASK,
+}
+
+
+def state_mask(min_state: SessionState) -> int:
+    """Bitmask of the session states that satisfy `min_state`."""
+    return _STATE_MASKS[min_state]
+
+
+def state_error(min_state: SessionState) -> SAPError:
+    """The SAPError reported when the session has not reached `min_state`."""
+    message, hint = _STATE_REQUIREMENTS[min_state]
+    return SAPError(message, hint=hint)
 
 
 class SAPSessionManager:
@@ -54,11 +103,28 @@ class SAPSessionManager:
 
     def __init__(self, output_dir: Path):
         self._lib = None          # RoboSAPiens library instance (lazy)
+        self._lib_lock = threading.Lock()
+        # keyword → (method_name, bound method or None, kind); see _resolve
+        self._method_cache: dict[str, tuple[str, Any, str]] = {}
         self._state = SessionState.DISCONNECTED
+        self._state_bits = 0      # int(self._state), for mask checks
         self._server_description: Optional[str] = None
         self._output_dir = output_dir
-        self._script_lines: list[str] = []   # For code generation
-        self._script_lock = threading.Lock()
+        # String prefix for screenshot paths: no Path object per capture
+        self._output_dir_str = os.path.join(output_dir, "")
+        # (keyword, args) for code generation. No lock: deque append/extend and
+        # the list() copy in get_script are atomic under the GIL, and
+        # clear_script swaps in a fresh deque.
+        self._script_buf: deque[tuple[str, tuple]] = deque()
+        self._last_error_screenshot: Optional[Future] = None
+        # Screenshot names: <label>_<process start>_<seq>.png — unique even
+        # for several captures within one second, and no strftime per shot
+        self._start_ts = time.strftime("%Y%m%d_%H%M%S")
+        self._shot_seq = itertools.count()
+        # Single dedicated thread for all RoboSAPiens / COM calls (see submit)
+        self._worker = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="sapient-sap", initializer=_com_init
+        )
 
     # ── Singleton ─────────────────────────────────────────────────────────────
     @classmethod
@@ -69,26 +135,36 @@ class SAPSessionManager:
 
     @classmethod
     def create(cls, output_dir: Path) -> "SAPSessionManager":
-        with cls._lock:
-            if cls._singleton is None:
-                cls._singleton = cls(output_dir)
-                log.info("SAPSessionManager created, output_dir=%s", output_dir)
+        # Double-checked locking: the lock is only taken until the singleton
+        # exists. The GIL makes the assignment visible to other threads.
+        if cls._singleton is None:
+            with cls._lock:
+                if cls._singleton is None:
+                    cls._singleton = cls(output_dir)
+                    log.info("SAPSessionManager created, output_dir=%s", output_dir)
         return cls._singleton
 
+    # ── Worker thread ─────────────────────────────────────────────────────────
+    def submit(self, fn, /, *args: Any, **kwargs: Any) -> Future:
+        """
+        Run fn on the dedicated SAP worker thread. SAP GUI scripting is
+        apartment-threaded, so every library call goes through this one
+        thread and the MCP event loop never blocks on it.
+        """
+        return self._worker.submit(fn, *args, **kwargs)
+
     # ── Library access ────────────────────────────────────────────────────────
     def _get_lib(self):
         """Lazy-initialise the RoboSAPiens library instance."""
-        if self._lib is None:
-            try:
-                from RoboSAPiens import RoboSAPiens  # noqa: PLC0415
-                self._lib = RoboSAPiens()
-                log.info("RoboSAPiens library instantiated")
-            except ImportError as e:
-                raise SAPError(
-                    "RoboSAPiens library not found",
-                    hint="Run: pip install robotframework-robosapiens",
-                    keyword="import",
-                ) from e
+        lib = self._lib
+        if lib is not None:
+            return lib
+        with self._lib_lock:
+            if self._lib is not None:
+                return self._lib
+            self._lib = _load_robosapiens_cls()()
+            self._method_cache.clear()  # entries hold bound methods of the old instance
+            log.info("RoboSAPiens library instantiated")
         return self._lib
 
     # ── Keyword → actual method name map ──────────────────────────────────────
@@ -105,36 +181,73 @@ class SAPSessionManager:
         # clear_text_field has no direct method — handled specially in execute()
     }
 
+    # Keywords implemented on this class rather than in RoboSAPiens
+    _COMPOSITE_KEYWORDS: frozenset[str] = frozenset({"fill_login_form", "button_exists"})
+
     # ── Core executor ─────────────────────────────────────────────────────────
+    def _resolve(self, lib: Any, keyword: str) -> tuple[str, Any, str]:
+        """
+        Resolve a keyword to (method_name, callable_or_None, kind) where kind is
+        "lib", "clear" (fill_text_field with an empty value) or "composite".
+        """
+        snake = keyword.translate(_KW_TRANS)
+        if snake in self._COMPOSITE_KEYWORDS:
+            return snake, getattr(self, snake), "composite"
+        if snake == "clear_text_field":
+            return "fill_text_field", getattr(lib, "fill_text_field", None), "clear"
+        # Apply name correction map
+        method_name = self._KEYWORD_MAP.get(snake, snake)
+        return method_name, getattr(lib, method_name, None), "lib"
+
+    def _lib_method(self, lib: Any, keyword: str) -> Any:
+        """The cached RoboSAPiens method behind `keyword`; SAPError if missing."""
+        resolved = self._method_cache.get(keyword)
+        if resolved is None:
+            resolved = self._method_cache[keyword] = self._resolve(lib, keyword)
+        method_name, method, _ = resolved
+        if method is None:
+            raise SAPError(
+                f"Unknown RoboSAPiens keyword: '{keyword}'",
+                hint=f"No method '{method_name}' on RoboSAPiens library.",
+                keyword=keyword,
+            )
+        return method
+
     def execute(self, keyword: str, *args: Any) -> Any:
         """
         Execute a RoboSAPiens keyword by its Python method name (snake_case).
         Uses _KEYWORD_MAP to correct any name mismatches between our API and
-        the actual RoboSAPiens 2.24.x library methods.
+        the actual RoboSAPiens 2.24.x library methods. Resolution is cached per
+        keyword string, so repeat calls skip the name munging and getattr.
         """
         lib = self._get_lib()
-        snake = keyword.lower().replace(" ", "_")
+        resolved = self._method_cache.get(keyword)
+        if resolved is None:
+            resolved = self._method_cache[keyword] = self._resolve(lib, keyword)
+        method_name, method, kind = resolved
 
+        if kind == "composite":
+            return method(*args)
         # Special case: "clear_text_field" → fill with empty string
-        if snake == "clear_text_field":
+        if kind == "clear":
             if not args:
                 raise SAPError("clear_text_field requires a label argument", keyword=keyword)
-            snake = "fill_text_field"
             args = (args[0], "")
 
-        # Apply name correction map
-        method_name = self._KEYWORD_MAP.get(snake, snake)
-        method = getattr(lib, method_name, None)
         if method is None:
             raise SAPError(
                 f"Unknown RoboSAPiens keyword: '{keyword}'",
                 hint=f"No method '{method_name}' on RoboSAPiens library.",
                 keyword=keyword,
             )
-        log.debug("EXEC  %-35s  method=%-35s  args=%s", keyword, method_name, args)
+        # Guarded: str(result)[:120] is evaluated eagerly, even at INFO
+        debug = log.isEnabledFor(logging.DEBUG)
+        if debug:
+            log.debug("EXEC  %-35s  method=%-35s  args=%s", keyword, method_name, args)
         try:
             result = method(*args)
-            log.debug("DONE  %-35s  result=%s", keyword, str(result)[:120])
+            if debug:
+                log.debug("DONE  %-35s  result=%s", keyword, str(result)[:120])
             return result
         except Exception as exc:
             err_msg = str(exc)
@@ -142,6 +255,120 @@ class SAPSessionManager:
             log.warning("FAIL  %-35s  error=%s", keyword, err_msg)
             raise SAPError(err_msg, hint=hint, keyword=keyword) from exc
 
+    def execute_linked(self, *calls: tuple) -> list[Any]:
+        """
+        Run dependent `(keyword, *args)` calls in order within one dispatch and
+        return all results, e.g.
+            execute_linked(("Execute Transaction", "VA01"), ("Get Window Title",))
+        The first failing call's SAPError propagates, with `completed` set to
+        the number of calls that ran before it.
+        """
+        execute = self.execute
+        results: list[Any] = []
+        try:
+            for keyword, *args in calls:
+                results.append(execute(keyword, *args))
+        except SAPError as exc:
+            exc.completed = len(results)
+            raise
+        return results
+
+    def _execute_many(self, keywords: list[str]) -> list[Any]:
+        """
+        Run independent argument-less keywords back-to-back and return their
+        results in order, with None in place of any that failed. Meant for
+        best-effort probes (e.g. a screen without a status bar): methods are
+        called directly and failures are logged once per batch at DEBUG,
+        rather than as one execute() WARNING each.
+        """
+        try:
+            lib = self._get_lib()
+        except SAPError as exc:
+            log.debug("PROBE %s  skipped: %s", keywords, exc)
+            return [None] * len(keywords)
+        cache = self._method_cache
+        results: list[Any] = []
+        failed: list[str] = []
+        for keyword in keywords:
+            resolved = cache.get(keyword)
+            if resolved is None:
+                resolved = cache[keyword] = self._resolve(lib, keyword)
+            method = resolved[1]
+            try:
+                results.append(method())
+            except Exception:
+                # Includes method None (unknown keyword) → TypeError
+                results.append(None)
+                failed.append(keyword)
+        if failed:
+            log.debug("PROBE %s  failed: %s", keywords, failed)
+        return results
+
+    def execute_batch(self, steps: list[tuple[str, tuple]]) -> list[Any]:
+        """
+        Execute several (keyword, args) steps back-to-back in one call and
+        return their results in order. Stops at the first failure, raising a
+        SAPError that says which step failed; its `completed` is the number
+        of steps that did run.
+        """
+        results: list[Any] = []
+        total = len(steps)
+        for i, (keyword, args) in enumerate(steps, 1):
+            try:
+                results.append(self.execute(keyword, *args))
+            except SAPError as exc:
+                err = SAPError(
+                    f"Step {i}/{total} failed ({len(results)} completed): {exc}",
+                    hint=exc.hint,
+                    keyword=keyword,
+                )
+                err.completed = len(results)
+                raise err from exc.__cause__
+        return results
+
+    def fill_login_form(self, client: str, user: str, password: str) -> None:
+        """
+        Fill Client / User / Password on the SAP logon screen and press Enter.
+        The library methods are resolved once and called back-to-back instead
+        of going through four separate execute() dispatches.
+        """
+        keyword = "Fill Login Form"
+        lib = self._get_lib()
+        # Same resolution (and _KEYWORD_MAP names) as the individual keywords
+        fill = self._lib_method(lib, "Fill Text Field")
+        press = self._lib_method(lib, "Send SAP Keys")
+        log.debug("EXEC  %-35s  user=%s", keyword, user)
+        try:
+            fill("Client", client)
+            fill("User", user)
+            fill("Password", password)
+            press("Enter")
+        except Exception as exc:
+            err_msg = str(exc)
+            hint = _extract_hint(err_msg)
+            log.warning("FAIL  %-35s  error=%s", keyword, err_msg)
+            raise SAPError(err_msg, hint=hint, keyword=keyword) from exc
+
+    def button_exists(self, label: str) -> bool:
+        """
+        Pure probe: True if a button with this label is on screen. Never raises
+        for a missing button — uses the library's own check when available,
+        else probes with highlight_button without the SAPError/hint/warning
+        machinery of execute().
+        """
+        lib = self._get_lib()
+        native = getattr(lib, "button_exists", None)
+        if native is not None:
+            try:
+                return bool(native(label))
+            except Exception:
+                return False
+        try:
+            lib.highlight_button(label)
+            return True
+        except Exception:
+            return False
+
     # ── State helpers ─────────────────────────────────────────────────────────
     @property
     def state(self) -> SessionState:
@@ -150,75 +377,99 @@ class SAPSessionManager:
     def set_state(self, state: SessionState) -> None:
         log.info("State transition: %s → %s", self._state.name, state.name)
         self._state = state
+        self._state_bits = int(state)
 
     def is_connected(self) -> bool:
-        return self._state in (SessionState.CONNECTED, SessionState.LOGGED_IN)
+        return bool(self._state_bits & _CONNECTED_MASK)
 
     def is_logged_in(self) -> bool:
-        return self._state == SessionState.LOGGED_IN
+        return bool(self._state_bits & _LOGGED_IN_MASK)
+
+    def _require(self, mask: int, min_state: SessionState) -> None:
+        if not self._state_bits & mask:
+            raise state_error(min_state)
 
     def require_connected(self) -> None:
-        if not self.is_connected():
-            raise SAPError(
-                "No active SAP connection",
-                hint="Call sap_open → sap_connect_to_server (or sap_connect_to_running) first.",
-            )
+        self._require(_CONNECTED_MASK, SessionState.CONNECTED)
 
     def require_logged_in(self) -> None:
-        if not self.is_logged_in():
-            raise SAPError(
-                "Not logged in to SAP",
-                hint="Complete login with sap_fill_text_field / sap_push_button, then the session auto-detects login.",
-            )
+        self._require(_LOGGED_IN_MASK, SessionState.LOGGED_IN)
 
     # ── Screenshot ────────────────────────────────────────────────────────────
-    def take_screenshot(self, label: str = "screenshot") -> Optional[str]:
-        """Capture SAP window screenshot; returns base64 PNG or None on failure."""
+    def take_screenshot(self, label: str = "screenshot") -> Optional[tuple[str, str]]:
+        """
+        Capture SAP window screenshot; returns (saved file path, base64 PNG),
+        or None on failure.
+        """
         try:
-            ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-            fname = self._output_dir / f"{label}_{ts}.png"
-            self.execute("Save Screenshot", str(fname))
-            data = fname.read_bytes()
+            fname = f"{self._output_dir_str}{label}_{self._start_ts}_{next(self._shot_seq)}.png"
+            self.execute("Save Screenshot", fname)
+            data = _read_file(fname)
             log.debug("Screenshot saved: %s (%d bytes)", fname, len(data))
-            return base64.b64encode(data).decode()
+            # b2a_base64 is the C routine behind b64encode, minus its extra copy
+            return fname, binascii.b2a_base64(data, newline=False).decode("ascii")
         except Exception as exc:
             log.warning("Screenshot failed: %s", exc)
             return None
 
+    def capture_screenshot_async(self, label: str = "error") -> Future:
+        """
+        Queue take_screenshot() on the SAP worker and return its Future, so an
+        error response isn't held up by PNG capture + base64 encoding. When
+        called from a tool body the capture runs right after the tool returns.
+        """
+        future = self.submit(self.take_screenshot, label)
+        self._last_error_screenshot = future
+        return future
+
+    @property
+    def last_error_screenshot(self) -> Optional[Future]:
+        return self._last_error_screenshot
+
+    @property
+    def lib_loaded(self) -> bool:
+        """False until RoboSAPiens has been imported and instantiated."""
+        return self._lib is not None
+
     # ── Code generation ───────────────────────────────────────────────────────
     def record(self, keyword: str, *args: Any) -> None:
         """Append an action to the generated Robot Framework script."""
-        arg_str = "    ".join(str(a) for a in args)
-        line = f"    {keyword}    {arg_str}" if arg_str else f"    {keyword}"
-        with self._script_lock:
-            self._script_lines.append(line)
+        self._script_buf.append((keyword, args))
+
+    def record_batch(self, steps: list[tuple[str, tuple]]) -> None:
+        """Append several (keyword, args) actions in one go."""
+        self._script_buf.extend(steps)
 
     def get_script(self) -> str:
         """Return the accumulated Robot Framework test script."""
-        with self._script_lock:
-            if not self._script_lines:
-                return "# No actions recorded yet."
-            body = "\n".join(self._script_lines)
-        # Build without textwrap.dedent — it strips the indentation from body lines
-        return (
+        steps = list(self._script_buf)
+        if not steps:
+            return "# No actions recorded yet."
+        # Lines are formatted here, once, rather than on every record() call.
+        # Header + steps go into one buffer — no intermediate body string.
+        buf = io.StringIO()
+        buf.write(
             "*** Settings ***\n"
             "Library    RoboSAPiens\n"
             "\n"
             "*** Test Cases ***\n"
             "Generated SAP Automation\n"
-            f"{body}\n"
         )
+        for keyword, args in steps:
+            buf.write(_format_step(keyword, args))
+            buf.write("\n")
+        return buf.getvalue()
 
     def clear_script(self) -> None:
-        with self._script_lock:
-            self._script_lines.clear()
+        self._script_buf = deque()
 
     # ── Snapshot (element inspection) ─────────────────────────────────────────
     def get_snapshot(self) -> dict:
         """
         Build a structured JSON snapshot of the current SAP window.
         Gives the LLM visibility into what's on-screen before acting.
-        Returns a dict with: window_title, fields, buttons, tabs, status_bar.
+        Returns a dict with: window_title, fields, buttons, tabs, status_bar,
+        state, server — one call instead of separate title / status reads.
         """
         self.require_logged_in()
         snapshot: dict[str, Any] = {
@@ -228,18 +479,12 @@ class SAPSessionManager:
             "tabs": [],
             "status_bar": None,
             "state": self._state.name,
+            "server": self._server_description,
         }
-        # Window title
-        try:
-            snapshot["window_title"] = self.execute("Get Window Title")
-        except SAPError:
-            pass
-
-        # Status bar
-        try:
-            snapshot["status_bar"] = self.execute("Read Status Bar")
-        except SAPError:
-            pass
+        # One pass over both reads; a failing read leaves its entry None
+        snapshot["window_title"], snapshot["status_bar"] = self._execute_many(
+            ["Get Window Title", "Read Status Bar"]
+        )
 
         # NOTE: RoboSAPiens does not expose a direct "list all elements" API.
         # The snapshot above gives essential context. For full element listing,
@@ -251,27 +496,101 @@ class SAPSessionManager:
 
 # ── Private helpers ────────────────────────────────────────────────────────────
 
+_ROBOSAPIENS_CLS: Optional[type] = None
+_robosapiens_lock = threading.Lock()
+
+
+def _load_robosapiens_cls() -> type:
+    """Import the RoboSAPiens class once per process (double-checked locking)."""
+    global _ROBOSAPIENS_CLS
+    cls = _ROBOSAPIENS_CLS
+    if cls is not None:
+        return cls
+    with _robosapiens_lock:
+        if _ROBOSAPIENS_CLS is None:
+            try:
+                from RoboSAPiens import RoboSAPiens  # noqa: PLC0415
+            except ImportError as e:
+                raise SAPError(
+                    "RoboSAPiens library not found",
+                    hint="Run: pip install robotframework-robosapiens",
+                    keyword="import",
+                ) from e
+            _ROBOSAPIENS_CLS = RoboSAPiens
+        return _ROBOSAPIENS_CLS
+
+
+_O_RDONLY_BINARY = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+
+
+def _read_file(path: str) -> bytes:
+    """
+    Read a whole file with os.open/fstat/read: one exact-size read, without
+    the buffered-IO layer of open(). Loops only on a short read.
+    """
+    fd = os.open(path, _O_RDONLY_BINARY)
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size)
+        while len(data) < size:
+            chunk = os.read(fd, size - len(data))
+            if not chunk:
+                break
+            data += chunk
+        return data
+    finally:
+        os.close(fd)
+
+
+def _format_step(keyword: str, args: tuple) -> str:
+    """Render one recorded action as a Robot Framework test-case line."""
+    arg_str = "    ".join(map(str, args))
+    return f"    {keyword}    {arg_str}" if arg_str else f"    {keyword}"
+
+
+def _com_init() -> None:
+    """Worker-thread initializer: enter a COM apartment when pywin32 is present."""
+    try:
+        import pythoncom  # noqa: PLC0415
+    except ImportError:
+        return
+    pythoncom.CoInitialize()
+
+
+# Hints in priority order; _HINT_TERMS maps each trigger phrase to its hint's index
+_HINTS: tuple[str, ...] = (
+    (
+        "Element not found. Check: (1) spelling of the label, "
+        "(2) the correct tab is active, "
+        "(3) call sap_get_window_title to confirm you are on the right screen."
+    ),
+    (
+        "SAP GUI scripting is not enabled. "
+        "Enable it in SAP Logon → Customize Local Layout (Alt+F12) → Options → Scripting, "
+        "AND ask BASIS to set sapgui/user_scripting=TRUE via RZ11."
+    ),
+    (
+        "Connection failed. Check: (1) SAP Logon is open, "
+        "(2) the server description matches exactly what appears in SAP Logon list, "
+        "(3) network connectivity to SAP."
+    ),
+    "Login failed. Verify credentials. Check for password expiry or account lock.",
+)
+_HINT_TERMS: dict[str, int] = {
+    "not found": 0,
+    "scripting": 1,
+    "connection": 2,
+    "server": 2,
+    "password": 3,
+    "login": 3,
+}
+_HINT_RE = re.compile("|".join(map(re.escape, _HINT_TERMS)), re.IGNORECASE)
+
+
 def _extract_hint(error_msg: str) -> str:
     """Parse common RoboSAPiens error messages into actionable hints."""
-    msg = error_msg.lower()
-    if "not found" in msg:
-        return (
-            "Element not found. Check: (1) spelling of the label, "
-            "(2) the correct tab is active, "
-            "(3) call sap_get_window_title to confirm you are on the right screen."
-        )
-    if "scripting" in msg:
-        return (
-            "SAP GUI scripting is not enabled. "
-            "Enable it in SAP Logon → Customize Local Layout (Alt+F12) → Options → Scripting, "
-            "AND ask BASIS to set sapgui/user_scripting=TRUE via RZ11."
-        )
-    if "connection" in msg or "server" in msg:
-        return (
-            "Connection failed. Check: (1) SAP Logon is open, "
-            "(2) the server description matches exactly what appears in SAP Logon list, "
-            "(3) network connectivity to SAP."
-        )
-    if "password" in msg or "login" in msg:
-        return "Login failed. Verify credentials. Check for password expiry or account lock."
-    return ""
\ No newline at end of file
+    # One scan for all trigger phrases; the highest-priority hit wins
+    matches = _HINT_RE.findall(error_msg)
+    if not matches:
+        return ""
+    return _HINTS[min(_HINT_TERMS[m.lower()] for m in matches)]